@@ -0,0 +1,185 @@
+# Research Project: Environmental Coherence Framework for Multi-Sensor Remote Sensing: Water Hyacinth Assessment in Lake Tana
+# Authours: Mohamed Rami Mahmoud , Luis A. Garcia , Ahmed Medhat  and Mostafa Aboelkhear
+# Developer: Prof. Mohamed Rami Mahmoud (ORCID: http://orcid.org/0000-0002-3393-987X)
+# Contact: ORCID: http://orcid.org/0000-0002-3393-987X
+# Version: <v1.0> | Date: <2025-10-16>
+
+# Combined Landsat run: the FAI, NDVI+FAI and FAI+NDWI products all come
+# from the same Landsat 8+9 collection and the same monthly median, so one
+# traversal computes the three indices, applies the three masks and writes
+# the three Excel files instead of three scripts repeating the work.
+
+# 1. Install and Import Libraries
+!pip install geemap --quiet
+
+import ee
+import time
+import pandas as pd
+from datetime import datetime
+
+# 2-3. Shared session setup: EE auth, the Drive mount and the ROI load all
+# happen once in lake_tana_common no matter how many scripts run
+from lake_tana_common import LS_FULL, roi, roi_geom
+
+# FAI baseline slope from the Landsat central wavelengths (655/865/1609 nm),
+# evaluated once at module load
+K_LANDSAT = (865 - 655) / (1609 - 655)
+
+# 4. Compute NDVI, FAI and NDWI in one pass over the raw bands
+def compute_indices_landsat(image):
+    # Per-pixel cloud/shadow mask from QA_PIXEL bits 3 and 4, so the
+    # composite reduces only clean pixels
+    qa = image.select('QA_PIXEL')
+    image = image.updateMask(
+        qa.bitwiseAnd(1 << 3).eq(0).And(qa.bitwiseAnd(1 << 4).eq(0)))
+
+    scale = 0.0000275
+    offset = -0.2
+
+    bands = {
+        'green': image.select('SR_B3'),
+        'red': image.select('SR_B4'),
+        'nir': image.select('SR_B5'),
+        'swir': image.select('SR_B6'),
+        's': scale,
+        'o': offset,
+        'k': K_LANDSAT
+    }
+
+    # Ratio indices need the scale/offset folded into the algebra
+    ndvi = image.expression(
+        '(nir - red)*s / ((nir + red)*s + 2*o)', bands).rename('NDVI')
+    ndwi = image.expression(
+        '(green - swir)*s / ((green + swir)*s + 2*o)', bands).rename('NDWI')
+
+    # FAI is linear in reflectance and the offsets cancel, so it stays in
+    # raw DN units (FAI_refl = scale * FAI_dn); the mask thresholds are rescaled
+    fai = image.expression(
+        'nir - (red + (swir - red)*k)', bands).rename('FAI')
+
+    return image.addBands([ndvi, fai, ndwi])
+
+# 5. Server-side monthly sweep: one composite feeds all three masks
+def indices_month_feature(pair):
+    pair = ee.List(pair)
+    year = ee.Number(pair.get(0))
+    month = ee.Number(pair.get(1))
+    start = ee.Date.fromYMD(year, month, 1)  # advance() handles month lengths
+
+    # The shared pre-filtered collection only needs the month window
+    ls = LS_FULL.filterDate(start, start.advance(1, 'month')).map(compute_indices_landsat)
+
+    # reduce() with parallelScale fans the composite across more workers;
+    # its output bands carry a _median suffix
+    median = ls.reduce(ee.Reducer.median(), parallelScale=4).clip(roi)
+    ndvi = median.select('NDVI_median')
+    fai = median.select('FAI_median')
+    ndwi = median.select('NDWI_median')
+
+    # Stack the three product masks so a single reduceRegion sums them all
+    # (FAI thresholds are the reflectance values expressed in DN units)
+    masks = ee.Image.cat([
+        fai.gt(0.005 / 0.0000275).rename('mask_FAI'),
+        ndvi.gt(0.3).And(fai.gt(0.002 / 0.0000275)).rename('mask_NDVI_FAI'),
+        fai.gt(0.002 / 0.0000275).And(ndwi.lt(0)).rename('mask_FAI_NDWI')
+    ])
+
+    counts = masks.reduceRegion(
+        reducer=ee.Reducer.sum(),
+        geometry=roi_geom,
+        scale=30,
+        maxPixels=1e10,
+        tileScale=4
+    )
+
+    populated = ee.Feature(None, {
+        'year': year,
+        'month': month,
+        'cloud': ls.aggregate_mean('CLOUD_COVER'),
+        # Sums of the 0/1 masks are pixel counts; 30 m pixels are 900 m2 each
+        'area_fai_m2': ee.Number(counts.get('mask_FAI')).multiply(900),
+        'area_ndvi_fai_m2': ee.Number(counts.get('mask_NDVI_FAI')).multiply(900),
+        'area_fai_ndwi_m2': ee.Number(counts.get('mask_FAI_NDWI')).multiply(900)
+    })
+    empty = ee.Feature(None, {'year': year, 'month': month})
+
+    # Only the taken branch is evaluated, so empty months stay cheap
+    return ee.Feature(ee.Algorithms.If(ls.size(), populated, empty))
+
+# 6. Batch the whole 2013-2024 sweep into a single request
+year_months = ee.List([[y, m] for y in range(2013, 2025) for m in (10, 11, 12)])
+monthly_fc = ee.FeatureCollection(year_months.map(indices_month_feature))
+
+# The export is the only evaluation of the sweep; the three Excel files
+# are then derived from the CSV it leaves on Drive instead of running the
+# identical computation again through getInfo
+task = ee.batch.Export.table.toDrive(
+    collection=monthly_fc,
+    description='LakeTana_All_Indices_Landsat',
+    folder='LakeTana_Exports',
+    fileFormat='CSV'
+)
+task.start()
+while task.active():
+    time.sleep(10)
+
+monthly_df = pd.read_csv(
+    '/content/drive/MyDrive/LakeTana_Exports/LakeTana_All_Indices_Landsat.csv')
+
+area_keys = {
+    'FAI': 'area_fai_m2',
+    'NDVI_FAI': 'area_ndvi_fai_m2',
+    'FAI_NDWI': 'area_fai_ndwi_m2'
+}
+rows = {product: [] for product in area_keys}
+
+for props in monthly_df.sort_values(['year', 'month']).to_dict('records'):
+    year, month = int(props['year']), int(props['month'])
+    # Empty months carry no area columns in the exported table
+    if pd.isna(props.get('area_fai_m2')):
+        print(f"⚠️ No images for {year}-{month:02d}")
+        continue
+
+    base = {
+        'Year': year,
+        'Month': month,
+        'Date of Satellite Selected': f'{year}-{month:02d}-01',
+        'Cloud Cover Percentage': round(props['cloud'], 2)
+    }
+    for product, key in area_keys.items():
+        rows[product].append({
+            **base,
+            'Area of Water Hyacinth in Lake Tana': round(props[key] / 1e6, 2)
+        })
+
+    areas = ' | '.join(f"{p}: {round(props[k] / 1e6, 2)} km²" for p, k in area_keys.items())
+    print(f"✅ {year}-{month:02d}: {areas} | Cloud: {base['Cloud Cover Percentage']}%")
+
+# 7. Export one Excel file per product from the shared traversal
+from google.colab import files
+
+outputs = {
+    'FAI': 'FAI_Landsat_2013_2024.xlsx',
+    'NDVI_FAI': 'NDVI_FAI_Combined_Landsat_2013_2024.xlsx',
+    'FAI_NDWI': 'FAI_NDWI_Combined_Landsat_2013_2024.xlsx'
+}
+
+for product, excel_path in outputs.items():
+    df = pd.DataFrame(rows[product])
+    df = df[[
+        'Year',
+        'Month',
+        'Date of Satellite Selected',
+        'Cloud Cover Percentage',
+        'Area of Water Hyacinth in Lake Tana'
+    ]]
+    df = df.sort_values(by='Date of Satellite Selected')
+
+    # xlsxwriter in constant_memory mode streams rows instead of building
+    # the whole workbook in memory
+    with pd.ExcelWriter(excel_path, engine='xlsxwriter',
+                        engine_kwargs={'options': {'constant_memory': True}}) as writer:
+        df.to_excel(writer, index=False)
+
+    print(f"\n📁 Final Excel file saved as: {excel_path}")
+    files.download(excel_path)
@@ -1,108 +1,139 @@
-# Research Project: Environmental Coherence Framework for Multi-Sensor Remote Sensing: Water Hyacinth Assessment in Lake Tana
-# Authours: Mohamed Rami Mahmoud , Luis A. Garcia , Ahmed Medhat  and Mostafa Aboelkhear  
-# Developer: Prof. Mohamed Rami Mahmoud (ORCID: http://orcid.org/0000-0002-3393-987X)
-# Contact: ORCID: http://orcid.org/0000-0002-3393-987X
-# Version: <v1.0> | Date: <2025-10-16>
-
-
-
-# 1. Install and Import Libraries
-!pip install geemap --quiet
-
-import ee
-import geemap
-import pandas as pd
-from datetime import datetime
-import geopandas as gpd
-from google.colab import drive
-
-# 2. Authenticate & Initialize Earth Engine
-ee.Authenticate()
-ee.Initialize(project='Your-Project-ID')
-
-# 3. Mount Google Drive
-drive.mount('/content/drive')
-gdf = gpd.read_file('/content/drive/MyDrive/shp/Area_of_study_Bigger.shp')
-roi = geemap.geopandas_to_ee(gdf)
-
-# 4. Function to compute FAI
-def compute_fai(image):
-    nir = image.select('B8')
-    red = image.select('B4')
-    swir = image.select('B11')
-    red_wl, nir_wl, swir_wl = 665, 842, 1610
-    slope = (swir.subtract(red)).multiply((nir_wl - red_wl) / (swir_wl - red_wl))
-    baseline = red.add(slope)
-    fai = nir.subtract(baseline).rename('FAI')
-    return image.addBands(fai)
-
-# 5. Function to compute monthly FAI area
-def get_fai_monthly(year, month):
-    start_date = f'{year}-{month:02d}-01'
-    end_date = f'{year}-{month:02d}-28' if month != 12 else f'{year}-{month:02d}-31'
-
-    s2 = ee.ImageCollection("COPERNICUS/S2_SR_HARMONIZED") \
-        .filterDate(start_date, end_date) \
-        .filterBounds(roi) \
-        .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE', 20)) \
-        .map(compute_fai)
-
-    size = s2.size().getInfo()
-    if size == 0:
-        print(f"⚠️ No images for {year}-{month:02d}")
-        return None
-
-    mean_cloud = s2.aggregate_mean('CLOUDY_PIXEL_PERCENTAGE').getInfo()
-    median = s2.median().clip(roi)
-    fai_mask = median.select('FAI').gt(0.005)
-    area_img = fai_mask.multiply(ee.Image.pixelArea())
-
-    stats = area_img.reduceRegion(
-        reducer=ee.Reducer.sum(),
-        geometry=roi.geometry(),
-        scale=10,
-        maxPixels=1e10
-    )
-
-    fai_area_sqkm = stats.get('FAI').getInfo()
-    if fai_area_sqkm is None:
-        return None
-
-    return {
-        'Year': year,
-        'Month': month,
-        'Date of Satellite Selected': start_date,
-        'Cloud Cover Percentage': round(mean_cloud, 2),
-        'Area of Water Hyacinth in Lake Tana': round(fai_area_sqkm / 1e6, 2)
-    }
-
-# 6. Loop through 2018–2024 and print each result
-results = []
-for year in range(2018, 2025):
-    for month in [10, 11, 12]:
-        try:
-            result = get_fai_monthly(year, month)
-            if result:
-                print(f"✅ {year}-{month:02d}: {result['Area of Water Hyacinth in Lake Tana']} km² | Cloud: {result['Cloud Cover Percentage']}%")
-                results.append(result)
-        except Exception as e:
-            print(f"❌ Error {year}-{month:02d}: {e}")
-
-# 7. Export to Excel in correct order
-df = pd.DataFrame(results)
-df = df[[
-    'Year',
-    'Month',
-    'Date of Satellite Selected',
-    'Cloud Cover Percentage',
-    'Area of Water Hyacinth in Lake Tana'
-]]
-df = df.sort_values(by='Date of Satellite Selected')
-
-output_path = 'FAI_Sentinel_Harmonized_2018_2024.xlsx'
-df.to_excel(output_path, index=False)
-
-# 8. Download
-from google.colab import files
-print(f"\n📁 Final Excel file saved as: {output_path}")
-files.download(output_path)
+# Research Project: Environmental Coherence Framework for Multi-Sensor Remote Sensing: Water Hyacinth Assessment in Lake Tana
+# Authours: Mohamed Rami Mahmoud , Luis A. Garcia , Ahmed Medhat  and Mostafa Aboelkhear  
+# Developer: Prof. Mohamed Rami Mahmoud (ORCID: http://orcid.org/0000-0002-3393-987X)
+# Contact: ORCID: http://orcid.org/0000-0002-3393-987X
+# Version: <v1.0> | Date: <2025-10-16>
+
+
+
+# 1. Install and Import Libraries
+!pip install geemap --quiet
+
+import ee
+import time
+import pandas as pd
+from datetime import datetime
+
+# 2-3. Shared session setup: EE auth, the Drive mount and the ROI load all
+# happen once in lake_tana_common no matter how many scripts run
+from lake_tana_common import S2_FULL, roi, roi_geom
+
+# FAI baseline slope from the Sentinel-2 central wavelengths (665/842/1610 nm),
+# evaluated once at module load
+K_S2 = (842 - 665) / (1610 - 665)
+
+# 4. Function to compute FAI
+def compute_fai(image):
+    # Per-pixel SCL mask: drop shadow (3), cloud (8, 9) and cirrus (10)
+    # pixels so the composite reduces only clean samples
+    scl = image.select('SCL')
+    image = image.updateMask(
+        scl.neq(3).And(scl.neq(8)).And(scl.neq(9)).And(scl.neq(10)))
+
+    nir = image.select('B8')
+    red = image.select('B4')
+    swir = image.select('B11')
+    slope = (swir.subtract(red)).multiply(K_S2)
+    baseline = red.add(slope)
+    fai = nir.subtract(baseline).rename('FAI')
+    # Tag each scene so qualityMosaic can rank pixels by scene cloudiness;
+    # the constant is masked to the scene's valid data so the mosaic falls
+    # back per-pixel to the next-best scene over clouds and footprint gaps
+    cloud_inv = ee.Image.constant(
+        ee.Number(100).subtract(image.get('CLOUDY_PIXEL_PERCENTAGE'))) \
+        .rename('cloud_inv').updateMask(image.select('B8').mask())
+    return image.addBands([fai, cloud_inv])
+
+# 5. Server-side monthly FAI area (mapped over all months at once)
+def fai_month_feature(pair):
+    pair = ee.List(pair)
+    year = ee.Number(pair.get(0))
+    month = ee.Number(pair.get(1))
+    start = ee.Date.fromYMD(year, month, 1)  # advance() handles month lengths
+
+    # The shared pre-filtered collection only needs the month window
+    s2 = S2_FULL.filterDate(start, start.advance(1, 'month')).map(compute_fai)
+
+    # qualityMosaic takes each pixel from the least cloudy scene: one read
+    # per scene instead of the per-pixel sort a median composite needs
+    composite = s2.qualityMosaic('cloud_inv').clip(roi)
+    fai_mask = composite.select('FAI').gt(0.005)
+
+    populated = ee.Feature(None, {
+        'year': year,
+        'month': month,
+        'cloud': s2.aggregate_mean('CLOUDY_PIXEL_PERCENTAGE'),
+        # Sum of the 0/1 mask is a pixel count; 10 m pixels are 100 m2 each
+        'area_m2': ee.Number(fai_mask.reduceRegion(
+            reducer=ee.Reducer.sum(),
+            geometry=roi_geom,
+            scale=10,
+            maxPixels=1e10,
+            tileScale=4
+        ).get('FAI')).multiply(100)
+    })
+    empty = ee.Feature(None, {'year': year, 'month': month})
+
+    # Only the taken branch is evaluated, so empty months stay cheap
+    return ee.Feature(ee.Algorithms.If(s2.size(), populated, empty))
+
+# 6. Batch the whole 2018–2024 sweep into a single request
+year_months = ee.List([[y, m] for y in range(2018, 2025) for m in (10, 11, 12)])
+monthly_fc = ee.FeatureCollection(year_months.map(fai_month_feature))
+
+# The export task is the sweep's only evaluation: wait for it, then build
+# the console summary and the Excel file from the CSV it wrote, instead of
+# evaluating the same collection a second time through getInfo
+task = ee.batch.Export.table.toDrive(
+    collection=monthly_fc,
+    description='LakeTana_FAI_Sentinel',
+    folder='LakeTana_Exports',
+    fileFormat='CSV'
+)
+task.start()
+while task.active():
+    time.sleep(10)
+
+monthly_df = pd.read_csv(
+    '/content/drive/MyDrive/LakeTana_Exports/LakeTana_FAI_Sentinel.csv')
+
+results = []
+for props in monthly_df.sort_values(['year', 'month']).to_dict('records'):
+    year, month = int(props['year']), int(props['month'])
+    # Empty months carry no area_m2 column value in the exported table
+    if pd.isna(props.get('area_m2')):
+        print(f"⚠️ No images for {year}-{month:02d}")
+        continue
+
+    result = {
+        'Year': year,
+        'Month': month,
+        'Date of Satellite Selected': f'{year}-{month:02d}-01',
+        'Cloud Cover Percentage': round(props['cloud'], 2),
+        'Area of Water Hyacinth in Lake Tana': round(props['area_m2'] / 1e6, 2)
+    }
+    print(f"✅ {year}-{month:02d}: {result['Area of Water Hyacinth in Lake Tana']} km² | Cloud: {result['Cloud Cover Percentage']}%")
+    results.append(result)
+
+# 7. Export to Excel in correct order
+df = pd.DataFrame(results)
+df = df[[
+    'Year',
+    'Month',
+    'Date of Satellite Selected',
+    'Cloud Cover Percentage',
+    'Area of Water Hyacinth in Lake Tana'
+]]
+df = df.sort_values(by='Date of Satellite Selected')
+
+output_path = 'FAI_Sentinel_Harmonized_2018_2024.xlsx'
+# xlsxwriter in constant_memory mode streams rows instead of building
+# the whole workbook in memory
+with pd.ExcelWriter(output_path, engine='xlsxwriter',
+                    engine_kwargs={'options': {'constant_memory': True}}) as writer:
+    df.to_excel(writer, index=False)
+
+# 8. Download
+from google.colab import files
+print(f"\n📁 Final Excel file saved as: {output_path}")
+files.download(output_path)
@@ -1,117 +1,147 @@
-# Research Project: Environmental Coherence Framework for Multi-Sensor Remote Sensing: Water Hyacinth Assessment in Lake Tana
-# Authours: Mohamed Rami Mahmoud , Luis A. Garcia , Ahmed Medhat  and Mostafa Aboelkhear  
-# Developer: Prof. Mohamed Rami Mahmoud (ORCID: http://orcid.org/0000-0002-3393-987X)
-# Contact: ORCID: http://orcid.org/0000-0002-3393-987X
-# Version: <v1.0> | Date: <2025-10-16>
-
-
-# 1. Install and Import Libraries
-!pip install geemap --quiet
-
-import ee
-import geemap
-import pandas as pd
-from datetime import datetime
-import geopandas as gpd
-from google.colab import drive
-
-# 2. Authenticate & Initialize Earth Engine
-ee.Authenticate()
-ee.Initialize(project='Your-Project-ID')
-
-# 3. Mount Google Drive and Load ROI
-drive.mount('/content/drive')
-gdf = gpd.read_file('/content/drive/MyDrive/shp/Area_of_study_Bigger.shp')
-roi = geemap.geopandas_to_ee(gdf)
-
-# 4. Compute NDVI + FAI for Sentinel-2
-def compute_ndvi_fai_sentinel(image):
-    red = image.select('B4')
-    nir = image.select('B8')
-    swir = image.select('B11')
-
-    # NDVI
-    ndvi = nir.subtract(red).divide(nir.add(red)).rename('NDVI')
-
-    # FAI for Sentinel-2
-    red_wl, nir_wl, swir_wl = 665, 842, 1610
-    slope = (swir.subtract(red)).multiply((nir_wl - red_wl) / (swir_wl - red_wl))
-    baseline = red.add(slope)
-    fai = nir.subtract(baseline).rename('FAI')
-
-    return image.addBands([ndvi, fai])
-
-# 5. Analyze each month using NDVI + FAI integration
-def get_ndvi_fai_monthly_s2(year, month):
-    start_date = f'{year}-{month:02d}-01'
-    end_date = f'{year}-{month:02d}-28' if month != 12 else f'{year}-{month:02d}-31'
-
-    s2 = (
-        ee.ImageCollection("COPERNICUS/S2_SR_HARMONIZED")
-        .filterDate(start_date, end_date)
-        .filterBounds(roi)
-        .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE', 20))
-        .map(compute_ndvi_fai_sentinel)
-    )
-
-    if s2.size().getInfo() == 0:
-        print(f"⚠️ No images for {year}-{month:02d}")
-        return None
-
-    cloud = s2.aggregate_mean('CLOUDY_PIXEL_PERCENTAGE').getInfo()
-    median = s2.median().clip(roi)
-
-    ndvi = median.select('NDVI')
-    fai = median.select('FAI')
-    mask = ndvi.gt(0.3).And(fai.gt(0.002))
-
-    area_img = mask.multiply(ee.Image.pixelArea())
-    stats = area_img.reduceRegion(
-        reducer=ee.Reducer.sum(),
-        geometry=roi.geometry(),
-        scale=10,
-        maxPixels=1e10
-    )
-
-    area_sqkm = stats.get('NDVI').getInfo()
-    if area_sqkm is None:
-        return None
-
-    return {
-        'Year': year,
-        'Month': month,
-        'Date of Satellite Selected': start_date,
-        'Cloud Cover Percentage': round(cloud, 2),
-        'Area of Water Hyacinth in Lake Tana': round(area_sqkm / 1e6, 2)
-    }
-
-# 6. Loop over years and months and print results
-results = []
-for year in range(2016, 2025):
-    for month in [10, 11, 12]:
-        try:
-            result = get_ndvi_fai_monthly_s2(year, month)
-            if result:
-                print(f"✅ {year}-{month:02d}: {result['Area of Water Hyacinth in Lake Tana']} km² | Cloud: {result['Cloud Cover Percentage']}%")
-                results.append(result)
-        except Exception as e:
-            print(f"❌ Error {year}-{month:02d}: {e}")
-
-# 7. Export to Excel
-df = pd.DataFrame(results)
-df = df[[
-    'Year',
-    'Month',
-    'Date of Satellite Selected',
-    'Cloud Cover Percentage',
-    'Area of Water Hyacinth in Lake Tana'
-]]
-df = df.sort_values(by='Date of Satellite Selected')
-
-excel_path = 'NDVI_FAI_Combined_Sentinel_2016_2024.xlsx'
-df.to_excel(excel_path, index=False)
-
-# 8. Download the Excel File
-from google.colab import files
-print(f"\n📁 Final Excel file saved as: {excel_path}")
-files.download(excel_path)
+# Research Project: Environmental Coherence Framework for Multi-Sensor Remote Sensing: Water Hyacinth Assessment in Lake Tana
+# Authours: Mohamed Rami Mahmoud , Luis A. Garcia , Ahmed Medhat  and Mostafa Aboelkhear  
+# Developer: Prof. Mohamed Rami Mahmoud (ORCID: http://orcid.org/0000-0002-3393-987X)
+# Contact: ORCID: http://orcid.org/0000-0002-3393-987X
+# Version: <v1.0> | Date: <2025-10-16>
+
+
+# 1. Install and Import Libraries
+!pip install geemap --quiet
+
+import ee
+import pandas as pd
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+# 2-3. Shared session setup: EE auth, the Drive mount and the ROI load all
+# happen once in lake_tana_common no matter how many scripts run
+from lake_tana_common import S2_FULL, cached_monthly, roi, roi_geom
+
+# FAI baseline slope from the Sentinel-2 central wavelengths (665/842/1610 nm),
+# evaluated once at module load
+K_S2 = (842 - 665) / (1610 - 665)
+
+# 4. Compute NDVI + FAI for Sentinel-2
+def compute_ndvi_fai_sentinel(image):
+    # Per-pixel SCL mask: drop shadow (3), cloud (8, 9) and cirrus (10)
+    # pixels so the composite reduces only clean samples
+    scl = image.select('SCL')
+    image = image.updateMask(
+        scl.neq(3).And(scl.neq(8)).And(scl.neq(9)).And(scl.neq(10)))
+
+    red = image.select('B4')
+    nir = image.select('B8')
+    swir = image.select('B11')
+
+    # NDVI
+    ndvi = nir.subtract(red).divide(nir.add(red)).rename('NDVI')
+
+    # FAI for Sentinel-2
+    slope = (swir.subtract(red)).multiply(K_S2)
+    baseline = red.add(slope)
+    fai = nir.subtract(baseline).rename('FAI')
+
+    # Tag each scene so qualityMosaic can rank pixels by scene cloudiness;
+    # the constant is masked to the scene's valid data so the mosaic falls
+    # back per-pixel to the next-best scene over clouds and footprint gaps
+    cloud_inv = ee.Image.constant(
+        ee.Number(100).subtract(image.get('CLOUDY_PIXEL_PERCENTAGE'))) \
+        .rename('cloud_inv').updateMask(image.select('B8').mask())
+    return image.addBands([ndvi, fai, cloud_inv])
+
+# 5. Analyze each month using NDVI + FAI integration
+# Reruns serve cached months from Drive instead of recomputing on GEE
+# Detection thresholds
+NDVI_THRESHOLD = 0.3
+FAI_THRESHOLD = 0.002
+
+@cached_monthly('ndvi_fai_sentinel', NDVI_THRESHOLD, FAI_THRESHOLD)
+def get_ndvi_fai_monthly_s2(year, month):
+    start_date = f'{year}-{month:02d}-01'
+    end_date = f'{year}-{month:02d}-28' if month != 12 else f'{year}-{month:02d}-31'
+
+    # The shared pre-filtered collection only needs the month window
+    s2 = S2_FULL.filterDate(start_date, end_date).map(compute_ndvi_fai_sentinel)
+
+    # qualityMosaic takes each pixel from the least cloudy scene: one read
+    # per scene instead of the per-pixel sort a median composite needs
+    composite = s2.qualityMosaic('cloud_inv').clip(roi)
+
+    ndvi = composite.select('NDVI')
+    fai = composite.select('FAI')
+    mask = ndvi.gt(NDVI_THRESHOLD).And(fai.gt(FAI_THRESHOLD))
+
+
+    # One RPC covers both the existence check and the stats: the empty
+    # branch short-circuits server-side instead of costing its own size() call
+    stats = ee.Dictionary(ee.Algorithms.If(s2.size(), ee.Dictionary({
+            'cloud': s2.aggregate_mean('CLOUDY_PIXEL_PERCENTAGE'),
+            'area': mask.reduceRegion(
+                reducer=ee.Reducer.sum(),
+                geometry=roi_geom,
+                scale=10,
+                maxPixels=1e10,
+                tileScale=4
+            ).get('NDVI')
+        }), ee.Dictionary({}))).getInfo()
+
+    if not stats:
+        print(f"⚠️ No images for {year}-{month:02d}")
+        return None
+
+    cloud = stats['cloud']
+    # Sum of the 0/1 mask is a pixel count; 10 m pixels are 100 m2 each
+    area_pixels = stats['area']
+    if area_pixels is None:
+        return None
+
+    return {
+        'Year': year,
+        'Month': month,
+        'Date of Satellite Selected': start_date,
+        'Cloud Cover Percentage': round(cloud, 2),
+        'Area of Water Hyacinth in Lake Tana': round(area_pixels * 100 / 1e6, 2)
+    }
+
+# 6. Run every month concurrently; each request is independent, so the
+# pool overlaps GEE latency instead of serializing the sweep
+def run_month(ym):
+    year, month = ym
+    try:
+        return get_ndvi_fai_monthly_s2(year, month)
+    except Exception as e:
+        print(f"❌ Error {year}-{month:02d}: {e}")
+        return None
+
+year_months = [(y, m) for y in range(2016, 2025) for m in (10, 11, 12)]
+with ThreadPoolExecutor(max_workers=12) as pool:
+    monthly_results = list(pool.map(run_month, year_months))
+
+results = []
+for result in monthly_results:
+    if result:
+        print(f"✅ {result['Year']}-{result['Month']:02d}: {result['Area of Water Hyacinth in Lake Tana']} km² | Cloud: {result['Cloud Cover Percentage']}%")
+        results.append(result)
+
+# 7. Export to Excel
+df = pd.DataFrame(results)
+df = df[[
+    'Year',
+    'Month',
+    'Date of Satellite Selected',
+    'Cloud Cover Percentage',
+    'Area of Water Hyacinth in Lake Tana'
+]]
+df = df.sort_values(by='Date of Satellite Selected')
+
+excel_path = 'NDVI_FAI_Combined_Sentinel_2016_2024.xlsx'
+# xlsxwriter in constant_memory mode streams rows instead of building
+# the whole workbook in memory
+with pd.ExcelWriter(excel_path, engine='xlsxwriter',
+                    engine_kwargs={'options': {'constant_memory': True}}) as writer:
+    df.to_excel(writer, index=False)
+
+# 8. Download the Excel File
+from google.colab import files
+print(f"\n📁 Final Excel file saved as: {excel_path}")
+files.download(excel_path)
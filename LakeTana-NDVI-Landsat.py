@@ -1,107 +1,124 @@
-# Research Project: Environmental Coherence Framework for Multi-Sensor Remote Sensing: Water Hyacinth Assessment in Lake Tana
-# Authours: Mohamed Rami Mahmoud , Luis A. Garcia , Ahmed Medhat  and Mostafa Aboelkhear  
-# Developer: Prof. Mohamed Rami Mahmoud (ORCID: http://orcid.org/0000-0002-3393-987X)
-# Contact: ORCID: http://orcid.org/0000-0002-3393-987X
-# Version: <v1.0> | Date: <2025-10-16>
-
-# 1. Install and Import Libraries
-!pip install geemap --quiet
-
-import ee
-import geemap
-import pandas as pd
-from datetime import datetime
-import geopandas as gpd
-from google.colab import drive
-
-# 2. Authenticate & Initialize Earth Engine
-ee.Authenticate()
-ee.Initialize(project='Your-Project-ID')
-
-# 3. Mount Google Drive and Load ROI
-drive.mount('/content/drive')
-gdf = gpd.read_file('/content/drive/MyDrive/shp/Area_of_study_Bigger.shp')
-roi = geemap.geopandas_to_ee(gdf)
-
-# 4. Function to compute NDVI from Landsat scaled reflectance
-def compute_ndvi_landsat(image):
-    scale = 0.0000275
-    offset = -0.2
-
-    red = image.select('SR_B4').multiply(scale).add(offset)
-    nir = image.select('SR_B5').multiply(scale).add(offset)
-    ndvi = nir.subtract(red).divide(nir.add(red)).rename('NDVI')
-    return image.addBands(ndvi)
-
-# 5. Function to calculate NDVI area per month
-def get_ndvi_monthly_landsat(year, month):
-    start_date = f'{year}-{month:02d}-01'
-    end_date = f'{year}-{month:02d}-28' if month != 12 else f'{year}-{month:02d}-31'
-
-    ls = (
-        ee.ImageCollection("LANDSAT/LC08/C02/T1_L2")
-        .merge(ee.ImageCollection("LANDSAT/LC09/C02/T1_L2"))
-        .filterDate(start_date, end_date)
-        .filterBounds(roi)
-        .filter(ee.Filter.lt('CLOUD_COVER', 20))
-        .map(compute_ndvi_landsat)
-    )
-
-    if ls.size().getInfo() == 0:
-        print(f"⚠️ No images for {year}-{month:02d}")
-        return None
-
-    cloud = ls.aggregate_mean('CLOUD_COVER').getInfo()
-    median = ls.median().clip(roi)
-    ndvi_mask = median.select('NDVI').gt(0.3)  # Adjust threshold if needed
-    area_img = ndvi_mask.multiply(ee.Image.pixelArea())
-
-    stats = area_img.reduceRegion(
-        reducer=ee.Reducer.sum(),
-        geometry=roi.geometry(),
-        scale=30,
-        maxPixels=1e10
-    )
-
-    ndvi_area_sqkm = stats.get('NDVI').getInfo()
-    if ndvi_area_sqkm is None:
-        return None
-
-    return {
-        'Year': year,
-        'Month': month,
-        'Date of Satellite Selected': start_date,
-        'Cloud Cover Percentage': round(cloud, 2),
-        'Area of Water Hyacinth in Lake Tana': round(ndvi_area_sqkm / 1e6, 2)
-    }
-
-# 6. Loop through each year and month
-results = []
-for year in range(2013, 2025):
-    for month in [10, 11, 12]:
-        try:
-            result = get_ndvi_monthly_landsat(year, month)
-            if result:
-                print(f"✅ {year}-{month:02d}: {result['Area of Water Hyacinth in Lake Tana']} km² | Cloud: {result['Cloud Cover Percentage']}%")
-                results.append(result)
-        except Exception as e:
-            print(f"❌ Error {year}-{month:02d}: {e}")
-
-# 7. Export to Excel
-df = pd.DataFrame(results)
-df = df[[
-    'Year',
-    'Month',
-    'Date of Satellite Selected',
-    'Cloud Cover Percentage',
-    'Area of Water Hyacinth in Lake Tana'
-]]
-df = df.sort_values(by='Date of Satellite Selected')
-
-excel_path = 'NDVI_Landsat_2013_2024.xlsx'
-df.to_excel(excel_path, index=False)
-
-# 8. Download
-from google.colab import files
-print(f"\n📁 Final Excel file saved as: {excel_path}")
-files.download(excel_path)
+# Research Project: Environmental Coherence Framework for Multi-Sensor Remote Sensing: Water Hyacinth Assessment in Lake Tana
+# Authours: Mohamed Rami Mahmoud , Luis A. Garcia , Ahmed Medhat  and Mostafa Aboelkhear  
+# Developer: Prof. Mohamed Rami Mahmoud (ORCID: http://orcid.org/0000-0002-3393-987X)
+# Contact: ORCID: http://orcid.org/0000-0002-3393-987X
+# Version: <v1.0> | Date: <2025-10-16>
+
+# 1. Install and Import Libraries
+!pip install geemap --quiet
+
+import ee
+import pandas as pd
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+# 2-3. Shared session setup: EE auth, the Drive mount and the ROI load all
+# happen once in lake_tana_common no matter how many scripts run
+from lake_tana_common import LS_FULL, cached_monthly, roi, roi_geom
+
+# 4. Function to compute NDVI from Landsat scaled reflectance
+def compute_ndvi_landsat(image):
+    # Per-pixel cloud/shadow mask from QA_PIXEL bits 3 and 4, so the
+    # composite reduces only clean pixels
+    qa = image.select('QA_PIXEL')
+    image = image.updateMask(
+        qa.bitwiseAnd(1 << 3).eq(0).And(qa.bitwiseAnd(1 << 4).eq(0)))
+
+    scale = 0.0000275
+    offset = -0.2
+
+    red = image.select('SR_B4').multiply(scale).add(offset)
+    nir = image.select('SR_B5').multiply(scale).add(offset)
+    ndvi = nir.subtract(red).divide(nir.add(red)).rename('NDVI')
+    return image.addBands(ndvi)
+
+# 5. Function to calculate NDVI area per month
+# Reruns serve cached months from Drive instead of recomputing on GEE
+NDVI_THRESHOLD = 0.3  # Adjust threshold if needed
+
+@cached_monthly('ndvi_landsat', NDVI_THRESHOLD)
+def get_ndvi_monthly_landsat(year, month):
+    start_date = f'{year}-{month:02d}-01'
+    end_date = f'{year}-{month:02d}-28' if month != 12 else f'{year}-{month:02d}-31'
+
+    # The shared pre-filtered collection only needs the month window
+    ls = LS_FULL.filterDate(start_date, end_date).map(compute_ndvi_landsat)
+
+    # reduce() with parallelScale fans the composite across more workers;
+    # its output bands carry a _median suffix
+    median = ls.reduce(ee.Reducer.median(), parallelScale=4).clip(roi)
+    ndvi_mask = median.select('NDVI_median').gt(NDVI_THRESHOLD)
+
+    # One RPC covers both the existence check and the stats: the empty
+    # branch short-circuits server-side instead of costing its own size() call
+    stats = ee.Dictionary(ee.Algorithms.If(ls.size(), ee.Dictionary({
+            'cloud': ls.aggregate_mean('CLOUD_COVER'),
+            'area': ndvi_mask.reduceRegion(
+                reducer=ee.Reducer.sum(),
+                geometry=roi_geom,
+                scale=30,
+                maxPixels=1e10,
+                tileScale=4
+            ).get('NDVI_median')
+        }), ee.Dictionary({}))).getInfo()
+
+    if not stats:
+        print(f"⚠️ No images for {year}-{month:02d}")
+        return None
+
+    cloud = stats['cloud']
+    # Sum of the 0/1 mask is a pixel count; 30 m pixels are 900 m2 each
+    ndvi_area_pixels = stats['area']
+    if ndvi_area_pixels is None:
+        return None
+
+    return {
+        'Year': year,
+        'Month': month,
+        'Date of Satellite Selected': start_date,
+        'Cloud Cover Percentage': round(cloud, 2),
+        'Area of Water Hyacinth in Lake Tana': round(ndvi_area_pixels * 900 / 1e6, 2)
+    }
+
+# 6. Run every month concurrently; each request is independent, so the
+# pool overlaps GEE latency instead of serializing the sweep
+def run_month(ym):
+    year, month = ym
+    try:
+        return get_ndvi_monthly_landsat(year, month)
+    except Exception as e:
+        print(f"❌ Error {year}-{month:02d}: {e}")
+        return None
+
+year_months = [(y, m) for y in range(2013, 2025) for m in (10, 11, 12)]
+with ThreadPoolExecutor(max_workers=12) as pool:
+    monthly_results = list(pool.map(run_month, year_months))
+
+results = []
+for result in monthly_results:
+    if result:
+        print(f"✅ {result['Year']}-{result['Month']:02d}: {result['Area of Water Hyacinth in Lake Tana']} km² | Cloud: {result['Cloud Cover Percentage']}%")
+        results.append(result)
+
+# 7. Export to Excel
+df = pd.DataFrame(results)
+df = df[[
+    'Year',
+    'Month',
+    'Date of Satellite Selected',
+    'Cloud Cover Percentage',
+    'Area of Water Hyacinth in Lake Tana'
+]]
+df = df.sort_values(by='Date of Satellite Selected')
+
+excel_path = 'NDVI_Landsat_2013_2024.xlsx'
+# xlsxwriter in constant_memory mode streams rows instead of building
+# the whole workbook in memory
+with pd.ExcelWriter(excel_path, engine='xlsxwriter',
+                    engine_kwargs={'options': {'constant_memory': True}}) as writer:
+    df.to_excel(writer, index=False)
+
+# 8. Download
+from google.colab import files
+print(f"\n📁 Final Excel file saved as: {excel_path}")
+files.download(excel_path)
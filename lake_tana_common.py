@@ -0,0 +1,102 @@
+# Research Project: Environmental Coherence Framework for Multi-Sensor Remote Sensing: Water Hyacinth Assessment in Lake Tana
+# Authours: Mohamed Rami Mahmoud , Luis A. Garcia , Ahmed Medhat  and Mostafa Aboelkhear
+# Developer: Prof. Mohamed Rami Mahmoud (ORCID: http://orcid.org/0000-0002-3393-987X)
+# Contact: ORCID: http://orcid.org/0000-0002-3393-987X
+# Version: <v1.0> | Date: <2025-10-16>
+
+# Shared session setup for all Lake Tana scripts. Authentication, the Drive
+# mount, the shapefile read and the GDF -> FeatureCollection conversion each
+# happen once per notebook session, no matter how many scripts import this.
+
+import hashlib
+import json
+from functools import lru_cache, wraps
+from pathlib import Path
+
+import ee
+import geemap
+import geopandas as gpd
+from google.colab import drive
+
+SHAPEFILE_PATH = '/content/drive/MyDrive/shp/Area_of_study_Bigger.shp'
+CACHE_DIR = Path('/content/drive/MyDrive/ee_cache')
+
+
+@lru_cache(maxsize=None)
+def init_ee():
+    try:
+        ee.Initialize(project='Your-Project-ID')
+    except Exception:
+        ee.Authenticate()
+        ee.Initialize(project='Your-Project-ID')
+
+
+@lru_cache(maxsize=None)
+def _shapefile_digest():
+    # Hash the shapefile contents, not its path: a re-drawn study area
+    # must invalidate every cached month
+    return hashlib.md5(Path(SHAPEFILE_PATH).read_bytes()).hexdigest()
+
+
+def cached_monthly(script, *params):
+    """Memoize a (year, month) -> result function as JSON files on Drive.
+
+    The monthly sweeps are deterministic for fixed inputs, so on a rerun
+    cached months are served from disk and only missing months hit Earth
+    Engine. Empty months are cached as null so they stay free as well.
+    The key folds in the shapefile digest and the caller's detection
+    thresholds, so editing either recomputes instead of serving stale
+    cached numbers.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(year, month):
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            key = hashlib.md5(
+                f'{script}-{year}-{month}-{_shapefile_digest()}-{params}'.encode()).hexdigest()
+            fp = CACHE_DIR / f'{key}.json'
+            if fp.exists():
+                return json.loads(fp.read_text())
+            result = func(year, month)
+            fp.write_text(json.dumps(result))
+            return result
+        return wrapper
+    return decorator
+
+
+@lru_cache(maxsize=None)
+def get_roi():
+    init_ee()
+    drive.mount('/content/drive')
+    gdf = gpd.read_file(SHAPEFILE_PATH)
+    return geemap.geopandas_to_ee(gdf)
+
+
+# Cached module-level aliases: reducer calls reuse one serialized geometry
+# instead of rebuilding it from the FeatureCollection every time. The
+# shapefile outline is simplified to one Landsat pixel (30 m) so each
+# request ships far fewer vertices; keep the full-resolution roi for
+# final clip() calls in exports.
+roi = get_roi()
+roi_geom = roi.geometry().simplify(maxError=30)
+
+# Pre-filtered source collections shared by every script: bounds and
+# scene-level cloud filters are built once, so each monthly function only
+# adds its month window with filterDate
+LS_FULL = (
+    ee.ImageCollection("LANDSAT/LC08/C02/T1_L2")
+    .merge(ee.ImageCollection("LANDSAT/LC09/C02/T1_L2"))
+    .filterBounds(roi_geom)
+    .filter(ee.Filter.lt('CLOUD_COVER', 20))
+)
+S2_FULL = (
+    ee.ImageCollection("COPERNICUS/S2_SR_HARMONIZED")
+    .filterBounds(roi_geom)
+    .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE', 20))
+)
+S1_FULL = (
+    ee.ImageCollection("COPERNICUS/S1_GRD")
+    .filter(ee.Filter.eq('instrumentMode', 'IW'))
+    .filter(ee.Filter.listContains('transmitterReceiverPolarisation', 'VH'))
+    .filterBounds(roi_geom)
+)